@@ -2,8 +2,17 @@
 Backend services for refugee case processing
 """
 
-from .case_processor import CaseProcessor
-from .pdf_generator import PDFReportGenerator
-
 __all__ = ["CaseProcessor", "PDFReportGenerator"]
 
+
+def __getattr__(name):
+    # Lazy re-exports (PEP 562): importing the backend package (e.g. for the
+    # lightweight openai_client module) must not pull in the langchain and
+    # reportlab stacks that CaseProcessor / PDFReportGenerator depend on
+    if name == "CaseProcessor":
+        from .case_processor import CaseProcessor
+        return CaseProcessor
+    if name == "PDFReportGenerator":
+        from .pdf_generator import PDFReportGenerator
+        return PDFReportGenerator
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,39 @@
+"""
+Shared OpenAI Client
+Single OpenAI client with a pooled HTTP transport, reused across pages
+"""
+
+import os
+
+# Read the key once at import time instead of on every client lookup
+_API_KEY = os.getenv("OPENAI_API_KEY")
+
+_client = None
+
+
+def get_shared_openai_client():
+    """
+    Return the process-wide OpenAI client, creating it on first use
+
+    The client is built with an httpx pool that keeps connections alive, so
+    the parallel Whisper/chat calls reuse warm TCP+TLS connections instead of
+    re-handshaking per request. Returns None when no API key is configured.
+    """
+    global _client
+
+    if _client is not None:
+        return _client
+
+    if not _API_KEY:
+        return None
+
+    import httpx
+    from openai import OpenAI
+
+    _client = OpenAI(
+        api_key=_API_KEY,
+        http_client=httpx.Client(
+            limits=httpx.Limits(max_keepalive_connections=20, max_connections=40)
+        )
+    )
+    return _client
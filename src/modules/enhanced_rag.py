@@ -5,6 +5,7 @@ This module combines traditional RAG (Retrieval-Augmented Generation) with
 Swiss Fedlex SPARQL queries to provide comprehensive legal assistance.
 """
 
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List, Any
 from langchain_core.output_parsers import StrOutputParser
 from langchain_openai import ChatOpenAI
@@ -15,7 +16,50 @@ from prompts.fedlex_prompts import (
     SPARQL_INTERPRETATION_PROMPT,
     COMBINED_PROMPT
 )
-from modules.fedlex_client import FedlexSPARQLClient, format_sparql_results
+from modules.fedlex_client import FedlexSPARQLClient, format_sparql_results, DEFAULT_CACHE_TTL
+
+
+# ============================================================================
+# CROSS-ENCODER RERANKER
+# ============================================================================
+
+# Cross-encoder models are expensive to load; cache them per (model, device)
+# like the embedding models in the analyzer
+_RERANKER_CACHE = {}
+
+DEFAULT_RERANK_MODEL = "BAAI/bge-reranker-v2-m3"
+
+
+class Reranker:
+    """
+    Cross-encoder reranker over oversampled vector candidates
+
+    Top-k cosine hits from the vector index often miss the doctrinally
+    relevant passage; scoring a larger candidate set with a cross-encoder
+    and keeping the best few recovers that recall for one batched forward.
+    """
+
+    def __init__(self, model_name: str = DEFAULT_RERANK_MODEL, device: str = None):
+        from sentence_transformers import CrossEncoder
+
+        self.model_name = model_name
+        key = (model_name, device)
+        model = _RERANKER_CACHE.get(key)
+        if model is None:
+            model = CrossEncoder(model_name, device=device)
+            _RERANKER_CACHE[key] = model
+        self.model = model
+
+    def rerank(self, query: str, docs: List[Any], top_k: int) -> List[Any]:
+        """Score (query, doc) pairs in one batch and keep the top_k docs"""
+        if len(docs) <= top_k:
+            return docs
+        scores = self.model.predict(
+            [(query, doc.page_content) for doc in docs],
+            batch_size=32
+        )
+        order = sorted(range(len(docs)), key=scores.__getitem__, reverse=True)
+        return [docs[i] for i in order[:top_k]]
 
 
 # ============================================================================
@@ -29,11 +73,14 @@ def build_enhanced_rag_chain(
     model: str = "gpt-5",
     fetch_xml: bool = True,
     xml_language: str = 'de',
-    enable_fedlex: bool = True
+    enable_fedlex: bool = True,
+    reranker: Reranker = None,
+    candidate_k: int = 30,
+    cache_ttl: int = DEFAULT_CACHE_TTL
 ):
     """
     Build enhanced RAG chain with routing between general documents and Swiss legislation
-    
+
     Args:
         vector_db: ChromaDB vector database for general documents
         api_key: OpenAI API key
@@ -42,18 +89,65 @@ def build_enhanced_rag_chain(
         fetch_xml: Whether to fetch full XML legal texts
         xml_language: Language for XML fetching ('de', 'fr', 'it', 'rm')
         enable_fedlex: Whether to enable Fedlex queries (can be disabled for testing)
-        
+        reranker: Optional cross-encoder Reranker; when set, retrieval
+            oversamples candidate_k docs and reranks down to k
+        candidate_k: Vector candidates to feed the reranker
+        cache_ttl: Seconds to keep Fedlex responses in the disk cache
+            (0 disables caching)
+
     Returns:
         Callable chain function
     """
     llm = ChatOpenAI(model=model, openai_api_key=api_key, temperature=0)
-    
+
     # Initialize Fedlex client with LLM for SPARQL generation
     fedlex_client = None
     if enable_fedlex:
-        fedlex_client = FedlexSPARQLClient(llm=llm)
-    
-    retriever = vector_db.as_retriever(search_kwargs={"k": k})
+        fedlex_client = FedlexSPARQLClient(llm=llm, cache_ttl=cache_ttl)
+
+    retriever = vector_db.as_retriever(
+        search_kwargs={"k": candidate_k if reranker else k}
+    )
+
+    def retrieve(query: str) -> List[Any]:
+        """Retrieve docs for a query, reranking oversampled candidates when
+        a cross-encoder is configured"""
+        docs = retriever.invoke(query)
+        if reranker:
+            docs = reranker.rerank(query, docs, top_k=k)
+        return docs
+
+    def retrieve_multi(queries: List[str]) -> List[Any]:
+        """
+        Retrieve for several query variants (e.g. multilingual expansions)
+
+        All variants are embedded in one batched encoder forward instead of
+        one model pass per variant; the merged candidates are deduplicated
+        and cut down to k (by the reranker when configured).
+        """
+        if len(queries) == 1:
+            return retrieve(queries[0])
+
+        embedder = getattr(vector_db, "embeddings", None)
+        n = candidate_k if reranker else k
+        seen = set()
+        docs = []
+        if embedder is not None:
+            vectors = embedder.embed_documents(list(queries))
+            candidate_lists = [
+                vector_db.similarity_search_by_vector(vec, k=n) for vec in vectors
+            ]
+        else:
+            candidate_lists = [retriever.invoke(q) for q in queries]
+        for candidates in candidate_lists:
+            for doc in candidates:
+                if doc.page_content not in seen:
+                    seen.add(doc.page_content)
+                    docs.append(doc)
+
+        if reranker:
+            return reranker.rerank(queries[0], docs, top_k=k)
+        return docs[:k]
 
     def format_docs(docs: List[Any]) -> str:
         """Format retrieved documents for prompt context"""
@@ -99,51 +193,88 @@ def build_enhanced_rag_chain(
         except Exception as e:
             return f"Error querying Fedlex: {str(e)}", False
 
-    def enhanced_chain(input_text: str) -> Dict[str, Any]:
+    def run_synthesis(chain, inputs: Dict[str, Any], on_token) -> str:
+        """Run the final LLM call, streaming tokens through on_token when a
+        callback is given so output appears at time-to-first-token"""
+        if on_token is None:
+            return chain.invoke(inputs)
+        parts = []
+        for chunk in chain.stream(inputs):
+            parts.append(chunk)
+            on_token(chunk)
+        return "".join(parts)
+
+    def enhanced_chain(
+        input_text: str,
+        query_variants: List[str] = None,
+        on_token=None,
+        skip_fedlex: bool = False
+    ) -> Dict[str, Any]:
         """
         Main chain logic with intelligent routing
-        
+
         Args:
             input_text: User's question
-            
+            query_variants: Optional rephrasings/translations of the question
+                to retrieve with alongside it (embedded in one batch)
+            on_token: Optional callable invoked with each token of the final
+                answer as it is generated
+            skip_fedlex: Force the RAG-only branch without consulting the
+                router (set by callers that pre-gated the question as not
+                Swiss-related); also skips the router LLM call
+
         Returns:
             Dictionary with answer, context, source, and metadata
         """
-        # Step 1: Route the question
-        print("\n" + "="*80)
-        print("[ROUTER] Analyzing question to determine best data source...")
-        print("="*80)
-        
-        route_chain = ROUTER_PROMPT | llm | StrOutputParser()
-        route_decision = route_chain.invoke({"input": input_text})
-        route = route_decision.strip().upper()
-        
-        print(f"[ROUTER] Decision: {route}")
-        print(f"[ROUTER] Explanation: ", end="")
-        if route == "RAG":
-            print("Question is about general/international legal documents only")
-        elif route == "BOTH":
-            print("Question involves Swiss context - using RAG to guide Fedlex searches")
+        # Step 1: Route the question. Vector retrieval is needed whichever
+        # way the router decides, so it runs in a worker thread while the
+        # router LLM call is in flight - the two overlap instead of
+        # executing back to back.
+        executor = ThreadPoolExecutor(max_workers=1)
+        docs_future = executor.submit(
+            retrieve_multi, [input_text] + list(query_variants or [])
+        )
+        executor.shutdown(wait=False)
+
+        if skip_fedlex:
+            # Caller already ruled out Swiss relevance; no router round-trip
+            route = "RAG"
+            print("\n[ROUTER] Skipped - question pre-gated as not Swiss-related\n")
         else:
-            # Fallback to BOTH for any unexpected routing
-            print("Defaulting to comprehensive search (BOTH)")
-            route = "BOTH"
-        print("="*80 + "\n")
+            print("\n" + "="*80)
+            print("[ROUTER] Analyzing question to determine best data source...")
+            print("="*80)
+
+            route_chain = ROUTER_PROMPT | llm | StrOutputParser()
+            route_decision = route_chain.invoke({"input": input_text})
+            route = route_decision.strip().upper()
+
+            print(f"[ROUTER] Decision: {route}")
+            print(f"[ROUTER] Explanation: ", end="")
+            if route == "RAG":
+                print("Question is about general/international legal documents only")
+            elif route == "BOTH":
+                print("Question involves Swiss context - using RAG to guide Fedlex searches")
+            else:
+                # Fallback to BOTH for any unexpected routing
+                print("Defaulting to comprehensive search (BOTH)")
+                route = "BOTH"
+            print("="*80 + "\n")
 
         # Step 2: Execute based on routing decision
         
         if route == "RAG" or not enable_fedlex:
             # Query only general document database
             print("[RAG] Querying general legal document database...")
-            docs = retriever.invoke(input_text)
+            docs = docs_future.result()
             context = format_docs(docs)
 
             print("[RAG] Generating expert legal analysis...")
             rag_chain = RAG_PROMPT | llm | StrOutputParser()
-            answer = rag_chain.invoke({
+            answer = run_synthesis(rag_chain, {
                 "context": context,
                 "input": input_text
-            })
+            }, on_token)
 
             return {
                 "answer": answer,
@@ -157,7 +288,7 @@ def build_enhanced_rag_chain(
             print("[BOTH] Comprehensive search: RAG + Fedlex (RAG guides Fedlex)")
             
             print("  → Retrieving from general document database (provides context)...")
-            docs = retriever.invoke(input_text)
+            docs = docs_future.result()
             rag_context = format_docs(docs)
             
             # Use RAG context to inform the Fedlex query
@@ -177,11 +308,11 @@ def build_enhanced_rag_chain(
 
             print("[BOTH] Synthesizing comprehensive legal analysis...")
             combined_chain = COMBINED_PROMPT | llm | StrOutputParser()
-            answer = combined_chain.invoke({
+            answer = run_synthesis(combined_chain, {
                 "rag_context": rag_context,
                 "sparql_results": sparql_results,
                 "input": input_text
-            })
+            }, on_token)
 
             return {
                 "answer": answer,
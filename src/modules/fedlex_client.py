@@ -5,18 +5,36 @@ This module provides functionality for querying the Swiss Fedlex legal database
 using SPARQL queries, including LLM-generated queries and XML document fetching.
 """
 
+import hashlib
+import io
+import json
+import os
 import re
+import time
 import requests
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from pathlib import Path
 from typing import Optional, Dict
 from SPARQLWrapper import SPARQLWrapper, JSON
 from langchain_core.output_parsers import StrOutputParser
 
 from prompts.fedlex_prompts import (
     SPARQL_GENERATION_PROMPT,
+    SPARQL_PARAMS_PROMPT,
+    FEDLEX_TEMPLATES,
     FEDLEX_SCHEMA_INFO
 )
 
+try:
+    from lxml import etree as _etree
+    # Compiled once at import; string() folds an element's text nodes
+    # without building intermediate lists
+    _ELEMENT_TEXT = _etree.XPath("string()")
+except ImportError:
+    _etree = None
+    _ELEMENT_TEXT = None
+
 
 # ============================================================================
 # CONSTANTS
@@ -39,6 +57,79 @@ LANGUAGE_URIS = {
 }
 
 
+# ============================================================================
+# DISK CACHE
+# ============================================================================
+
+# SPARQL results and consolidated-law XML are effectively immutable per
+# (query, language), so repeat invocations hit local disk instead of the
+# Fedlex endpoint
+CACHE_DIR = Path(os.path.expanduser("~/.cache/probotno"))
+DEFAULT_CACHE_TTL = 86400
+
+
+def _canonicalize_sparql(query: str) -> str:
+    """Collapse whitespace so formatting-only differences between generated
+    queries still share one cache entry"""
+    return " ".join(query.split())
+
+
+def _cache_file(namespace: str, key: str) -> Path:
+    digest = hashlib.sha256(key.encode("utf-8")).hexdigest()
+    return CACHE_DIR / namespace / digest
+
+
+def _cache_get(namespace: str, key: str, ttl: int):
+    """Return the cached content for key as bytes, or None on
+    miss/expiry/disabled"""
+    if not ttl:
+        return None
+    path = _cache_file(namespace, key)
+    try:
+        if time.time() - path.stat().st_mtime > ttl:
+            return None
+        return path.read_bytes()
+    except OSError:
+        return None
+
+
+def _cache_put(namespace: str, key: str, data: bytes):
+    """Store bytes under key, atomically so readers never see partial files"""
+    path = _cache_file(namespace, key)
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(path.name + ".tmp")
+        tmp.write_bytes(data)
+        tmp.replace(path)
+    except OSError:
+        pass
+
+
+# ============================================================================
+# SHARED HTTP SESSION
+# ============================================================================
+
+_http_session = None
+
+
+def _get_http_session() -> requests.Session:
+    """
+    Shared requests session with a keep-alive connection pool
+
+    Each XML download to fedlex.admin.ch otherwise pays a fresh TCP+TLS
+    handshake (~100-300ms); a pooled session reuses warm connections across
+    all fetches in the process, including the parallel ones.
+    """
+    global _http_session
+    if _http_session is None:
+        session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(pool_connections=8, pool_maxsize=20)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        _http_session = session
+    return _http_session
+
+
 # ============================================================================
 # FEDLEX SPARQL CLIENT
 # ============================================================================
@@ -46,18 +137,24 @@ LANGUAGE_URIS = {
 class FedlexSPARQLClient:
     """Enhanced client for querying Swiss Fedlex with LLM-generated SPARQL"""
 
-    def __init__(self, endpoint: str = FEDLEX_SPARQL_ENDPOINT, llm=None):
+    def __init__(
+        self,
+        endpoint: str = FEDLEX_SPARQL_ENDPOINT,
+        llm=None,
+        cache_ttl: int = DEFAULT_CACHE_TTL
+    ):
         """
         Initialize Fedlex SPARQL client
-        
+
         Args:
             endpoint: SPARQL endpoint URL
             llm: Language model for generating SPARQL queries
+            cache_ttl: Seconds to keep SPARQL results and XML documents in
+                the disk cache (0 disables caching)
         """
         self.endpoint = endpoint
-        self.sparql = SPARQLWrapper(endpoint)
-        self.sparql.setReturnFormat(JSON)
         self.llm = llm
+        self.cache_ttl = cache_ttl
 
         self.prefixes = """
 PREFIX rdf: <http://www.w3.org/1999/02/22-rdf-syntax-ns#>
@@ -72,16 +169,26 @@ PREFIX schema: <http://schema.org/>
     def generate_sparql_query(self, natural_language_question: str) -> str:
         """
         Use LLM to generate SPARQL query from natural language
-        
+
+        Tries the cheap path first: the LLM emits only search parameters
+        (keywords, language) that are substituted into a prepared query
+        template, costing a handful of output tokens and producing
+        byte-identical queries for identical parameters. Falls back to
+        free-form query generation when the parameters cannot be used.
+
         Args:
             natural_language_question: User's question in natural language
-            
+
         Returns:
             Generated SPARQL query string
         """
         if not self.llm:
             raise ValueError("LLM not initialized for SPARQL generation")
 
+        templated = self._generate_templated_query(natural_language_question)
+        if templated:
+            return templated
+
         query_chain = SPARQL_GENERATION_PROMPT | self.llm | StrOutputParser()
         generated_query = query_chain.invoke({
             "schema_info": FEDLEX_SCHEMA_INFO,
@@ -103,6 +210,19 @@ PREFIX schema: <http://schema.org/>
 
         return generated_query
 
+    def _generate_templated_query(self, natural_language_question: str) -> Optional[str]:
+        """Ask the LLM for template parameters and build the query locally,
+        or return None when the parameters are unusable"""
+        try:
+            params_chain = SPARQL_PARAMS_PROMPT | self.llm | StrOutputParser()
+            raw = params_chain.invoke({"question": natural_language_question}).strip()
+            raw = re.sub(r'^```(?:json)?\s*', '', raw)
+            raw = re.sub(r'\s*```$', '', raw)
+            params = json.loads(raw)
+            return build_templated_query("keyword_search_by_lang", params)
+        except Exception:
+            return None
+
     def execute_query(self, sparql_query: str, include_prefixes: bool = True) -> Dict:
         """
         Execute a SPARQL query and return results
@@ -120,10 +240,22 @@ PREFIX schema: <http://schema.org/>
             else:
                 full_query = sparql_query
 
+            cache_key = _canonicalize_sparql(full_query)
+            cached = _cache_get("sparql", cache_key, self.cache_ttl)
+            if cached is not None:
+                print("\n[SPARQL] Serving cached result")
+                return json.loads(cached)
+
             print(f"\n[EXECUTING SPARQL QUERY]:\n{full_query}\n")
 
-            self.sparql.setQuery(full_query)
-            results = self.sparql.query().convert()
+            # A fresh wrapper per call: SPARQLWrapper mutates internal state
+            # in setQuery, so a shared instance is not safe for the parallel
+            # XML-link lookups
+            sparql = SPARQLWrapper(self.endpoint)
+            sparql.setReturnFormat(JSON)
+            sparql.setQuery(full_query)
+            results = sparql.query().convert()
+            _cache_put("sparql", cache_key, json.dumps(results).encode("utf-8"))
             return results
         except Exception as e:
             return {"error": str(e)}
@@ -212,6 +344,17 @@ PREFIX schema: <http://schema.org/>
                     "error": "XML URL not found in query results"
                 }
 
+            cached = _cache_get("xml", xml_url, self.cache_ttl)
+            if cached is not None:
+                return {
+                    "status": "success",
+                    "consolidation_uri": consolidation_uri,
+                    "xml_url": xml_url,
+                    "language": language,
+                    "content": cached.decode("utf-8"),
+                    "size_bytes": len(cached)
+                }
+
             # Fetch the XML content
             print(f"\n[FETCHING XML]: {xml_url}")
 
@@ -219,9 +362,11 @@ PREFIX schema: <http://schema.org/>
                 'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
             }
 
-            response = requests.get(xml_url, headers=headers, timeout=timeout)
+            response = _get_http_session().get(xml_url, headers=headers, timeout=timeout)
             response.raise_for_status()
 
+            _cache_put("xml", xml_url, response.content)
+
             return {
                 "status": "success",
                 "consolidation_uri": consolidation_uri,
@@ -249,6 +394,76 @@ PREFIX schema: <http://schema.org/>
 # HELPER FUNCTIONS
 # ============================================================================
 
+def extract_articles(xml_bytes) -> list:
+    """
+    Stream-parse a consolidated-law XML and return the text of each article
+
+    iterparse visits elements as they finish and the processed subtrees are
+    cleared immediately, so memory stays constant instead of ~5x the file
+    size for a full element tree. Tag matching is namespace-agnostic since
+    Fedlex serves documents under varying schemas.
+
+    Args:
+        xml_bytes: XML document as a bytes-like buffer
+
+    Returns:
+        List of article text strings; empty when lxml is unavailable, the
+        document is malformed, or it contains no article elements
+    """
+    if _etree is None:
+        return []
+
+    articles = []
+    try:
+        for _, elem in _etree.iterparse(io.BytesIO(bytes(xml_bytes))):
+            if _etree.QName(elem).localname.lower() == "article":
+                text = " ".join(_ELEMENT_TEXT(elem).split())
+                if text:
+                    articles.append(text)
+                elem.clear(keep_tail=True)
+    except _etree.XMLSyntaxError:
+        return []
+    return articles
+
+
+def build_templated_query(template_name: str, params: Dict) -> Optional[str]:
+    """
+    Substitute LLM-extracted parameters into a prepared SPARQL template
+
+    Keywords are deduplicated, lowercased and sorted so identical parameter
+    sets always produce byte-identical queries (and therefore hit the same
+    disk-cache entry).
+
+    Args:
+        template_name: Key into FEDLEX_TEMPLATES
+        params: Dict with "keywords" (list of str) and optional "language"
+
+    Returns:
+        The SPARQL query string, or None when the parameters are unusable
+    """
+    template = FEDLEX_TEMPLATES.get(template_name)
+    if template is None:
+        return None
+
+    keywords = sorted({
+        str(kw).strip().lower().replace('"', '')
+        for kw in params.get("keywords", [])
+        if str(kw).strip()
+    })
+    if not keywords:
+        return None
+
+    keyword_filters = " ||\n        ".join(
+        f'CONTAINS(LCASE(?title), "{kw}")' for kw in keywords
+    )
+    language_uri = LANGUAGE_URIS.get(params.get("language", "de"), LANGUAGE_URIS["de"])
+
+    return template.substitute(
+        language_uri=language_uri,
+        keyword_filters=keyword_filters
+    )
+
+
 def is_law_applicable(
     date_applicability: str, 
     date_end_applicability: str, 
@@ -396,6 +611,24 @@ def format_sparql_results(
 
     output += f"**Found {len(filtered_bindings)} applicable result(s)** (out of {len(bindings)} total):\n\n"
 
+    # Prefetch the XML documents for all applicable laws in parallel: each
+    # fetch is a SPARQL link lookup plus an HTTPS download, so N laws cost
+    # roughly one fetch instead of N serial round-trips
+    xml_results = {}
+    if fetch_xml and fedlex_client:
+        uris = [
+            b.get("consolidation", {}).get("value", "")
+            for b in filtered_bindings
+        ]
+        uris = [u for u in uris if u]
+        if uris:
+            with ThreadPoolExecutor(max_workers=min(8, len(uris))) as executor:
+                fetched = executor.map(
+                    lambda uri: fedlex_client.fetch_xml_document(uri, language=language),
+                    uris
+                )
+                xml_results = dict(zip(uris, fetched))
+
     for i, binding in enumerate(filtered_bindings, 1):
         output += f"**Result {i}:**\n"
 
@@ -429,23 +662,39 @@ def format_sparql_results(
         # Fetch XML content if requested - THIS IS KEY FOR LLM ANALYSIS
         if fetch_xml and consolidation_uri and fedlex_client:
             output += f"\n  **Fetching full XML legal text ({language})...**\n"
-            xml_result = fedlex_client.fetch_xml_document(consolidation_uri, language=language)
+            xml_result = xml_results[consolidation_uri]
 
             if xml_result["status"] == "success":
                 xml_content = xml_result["content"]
                 output += f"  - ✓ XML fetched successfully ({xml_result['size_bytes']} bytes)\n"
                 output += f"  - XML URL: {xml_result['xml_url']}\n\n"
                 
-                # Include FULL XML content for LLM analysis with clear markers
-                output += "  **FULL LEGAL TEXT (XML - for citation and analysis):**\n"
-                output += "  ```xml\n"
-                output += f"  {xml_content}\n"
-                output += "  ```\n\n"
-                
-                output += "  ⚠️ **IMPORTANT**: The above XML contains the complete legal text. "
-                output += "Please extract and cite specific articles, sections, and provisions "
-                output += "relevant to the lawyer's question.\n"
-                
+                # Prefer extracted article text over dumping the raw XML:
+                # the markup roughly triples the prompt size without adding
+                # anything the LLM can cite
+                articles = extract_articles(xml_content.encode("utf-8"))
+
+                if articles:
+                    output += "  **FULL LEGAL TEXT (extracted articles - for citation and analysis):**\n"
+                    for article in articles:
+                        output += f"  - {article}\n"
+                    output += "\n"
+
+                    output += "  ⚠️ **IMPORTANT**: The above articles contain the legal text. "
+                    output += "Please cite specific articles, sections, and provisions "
+                    output += "relevant to the lawyer's question.\n"
+                else:
+                    # Fall back to the raw XML when lxml is unavailable or
+                    # the document has no recognizable article elements
+                    output += "  **FULL LEGAL TEXT (XML - for citation and analysis):**\n"
+                    output += "  ```xml\n"
+                    output += f"  {xml_content}\n"
+                    output += "  ```\n\n"
+
+                    output += "  ⚠️ **IMPORTANT**: The above XML contains the complete legal text. "
+                    output += "Please extract and cite specific articles, sections, and provisions "
+                    output += "relevant to the lawyer's question.\n"
+
                 # Store for potential use
                 binding["_xml_content"] = xml_content
             else:
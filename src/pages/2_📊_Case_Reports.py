@@ -7,41 +7,154 @@ import streamlit as st
 import os
 import sys
 import json
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from operator import itemgetter
 from pathlib import Path
 
 # Add parent directory to path
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-def load_case_metadata(case_dir: str) -> dict:
-    """Load case metadata from JSON file"""
+CASES_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "cases")
+
+CASES_PER_PAGE = 20
+
+try:
+    # C-implemented JSON parser, several times faster than stdlib json on
+    # the cold-load path where every metadata.json is decoded
+    import orjson
+
+    def _parse_json_bytes(raw: bytes) -> dict:
+        return orjson.loads(raw)
+except ImportError:
+    def _parse_json_bytes(raw: bytes) -> dict:
+        return json.loads(raw)
+
+@st.cache_data(show_spinner=False)
+def _load_case_metadata(metadata_path: str, metadata_mtime: float) -> dict:
+    """Parse one metadata.json, cached per file mtime so editing a single
+    case does not invalidate the whole listing"""
+    with open(metadata_path, "rb") as f:
+        return _parse_json_bytes(f.read())
+
+@st.cache_data(show_spinner=False)
+def _read_head(path: str, mtime: float, n: int = 512) -> str:
+    """Read only the first n characters of a text file (cached per mtime),
+    instead of pulling whole transcripts into memory for a preview"""
+    with open(path, "r", encoding="utf-8") as f:
+        return f.read(n)
+
+@st.cache_data(show_spinner=False)
+def _read_text(path: str, mtime: float) -> str:
+    """Read a whole text file, cached per mtime across reruns"""
+    return Path(path).read_text(encoding="utf-8")
+
+@st.cache_data(show_spinner=False)
+def _read_bytes(path: str, mtime: float) -> bytes:
+    """Read a binary file once per mtime; reruns serve the cached bytes"""
+    return Path(path).read_bytes()
+
+def _probe_present_files(case_dir: str) -> set:
+    """Collect the file names present under a case directory in one
+    readdir pass per directory, replacing per-path exists() stats"""
+    present = set()
+    stack = [case_dir]
+    while stack:
+        try:
+            with os.scandir(stack.pop()) as it:
+                for e in it:
+                    if e.is_dir(follow_symlinks=False):
+                        stack.append(e.path)
+                    else:
+                        present.add(e.name)
+        except FileNotFoundError:
+            pass
+    return present
+
+def _load_one_case(case_dir: str):
+    """Load and enrich the metadata for a single case directory, or return
+    None when it has no metadata.json"""
     metadata_path = os.path.join(case_dir, "metadata.json")
-    if os.path.exists(metadata_path):
-        with open(metadata_path, "r") as f:
-            return json.load(f)
-    return None
+    try:
+        metadata = _load_case_metadata(
+            metadata_path, os.stat(metadata_path).st_mtime
+        )
+    except FileNotFoundError:
+        return None
+    metadata["case_dir"] = case_dir
+    metadata["_present"] = _probe_present_files(case_dir)
+    # Parse the creation timestamp once here so the sort key,
+    # sidebar stats and detail rendering all share it
+    try:
+        created_dt = datetime.fromisoformat(metadata.get("created_at", ""))
+    except ValueError:
+        created_dt = None
+    metadata["_created_dt"] = created_dt
+    # Format the display strings once per load instead of strftime-ing
+    # per case per rerun on the render path
+    if created_dt is not None:
+        metadata["_created_date_str"] = created_dt.strftime("%B %d, %Y")
+        metadata["_created_time_str"] = created_dt.strftime("%H:%M")
+    else:
+        metadata["_created_date_str"] = "N/A"
+        metadata["_created_time_str"] = "N/A"
+    # Precompute the filter/sort keys so the per-keystroke
+    # search path is a plain substring scan with no allocations
+    metadata["_name_lower"] = metadata.get("name", "").lower()
+    metadata["_unhcr_lower"] = metadata.get("unhcr_number", "").lower()
+    metadata["_created_at"] = metadata.get("created_at", "")
+    return metadata
 
-def get_all_cases() -> list:
-    """Get list of all case directories"""
-    cases_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)), "cases")
-    
-    if not os.path.exists(cases_dir):
+@st.cache_data(show_spinner=False)
+def _load_cases(cases_dir: str, dir_mtime: float) -> list:
+    """Scan the cases directory, cached on its mtime - reruns triggered by
+    search/sort widgets reuse the cached list instead of re-reading disk"""
+    try:
+        # A single scandir pass: DirEntry.is_dir reuses the type info from
+        # readdir, and opening metadata.json directly (EAFP) avoids a
+        # separate exists() stat per case
+        with os.scandir(cases_dir) as it:
+            case_dirs = [
+                entry.path for entry in it
+                if entry.is_dir(follow_symlinks=False)
+            ]
+    except FileNotFoundError:
         return []
-    
-    cases = []
-    for case_dir in os.listdir(cases_dir):
-        full_path = os.path.join(cases_dir, case_dir)
-        if os.path.isdir(full_path):
-            metadata = load_case_metadata(full_path)
-            if metadata:
-                metadata["case_dir"] = full_path
-                cases.append(metadata)
-    
+
+    if not case_dirs:
+        return []
+
+    # The per-case work is pure I/O (open+read metadata.json plus the
+    # _present probe), so overlapping it in threads turns N serial reads
+    # into roughly N/workers - this only runs on a cache miss
+    with ThreadPoolExecutor(max_workers=min(16, len(case_dirs))) as executor:
+        cases = [
+            c for c in executor.map(_load_one_case, case_dirs)
+            if c is not None
+        ]
+
     # Sort by creation date (newest first)
-    cases.sort(key=lambda x: x.get("created_at", ""), reverse=True)
-    
+    cases.sort(key=itemgetter("_created_at"), reverse=True)
+
     return cases
 
+def get_all_cases() -> list:
+    """Get list of all case directories"""
+    try:
+        # The directory mtime is the cache key: adding or removing a case
+        # bumps it and invalidates the cached listing automatically
+        mtime_ns = os.stat(CASES_DIR).st_mtime_ns
+    except FileNotFoundError:
+        return []
+    # Session-level short circuit: st.cache_data returns a fresh copy of the
+    # case list on every call, so an unchanged directory still pays a
+    # deserialization per rerun. Keeping the list in session_state keyed on
+    # the same mtime makes a no-change rerun a single stat call.
+    if st.session_state.get("_cases_cache_key") != mtime_ns:
+        st.session_state["_cases"] = _load_cases(CASES_DIR, mtime_ns)
+        st.session_state["_cases_cache_key"] = mtime_ns
+    return st.session_state["_cases"]
+
 # Page configuration
 st.title("📊 Case Reports")
 st.markdown("View and access completed legal analysis reports")
@@ -88,17 +201,21 @@ else:
         search_term = search_term.lower()
         filtered_cases = [
             c for c in cases
-            if search_term in c.get("name", "").lower() or
-               search_term in c.get("unhcr_number", "").lower()
+            if search_term in c["_name_lower"] or
+               search_term in c["_unhcr_lower"]
         ]
-    
-    # Sort cases
-    if sort_option == "Oldest First":
-        filtered_cases.sort(key=lambda x: x.get("created_at", ""))
+
+    # Sort cases (itemgetter keys run at C level, no lambda per comparison).
+    # The session-cached list persists across reruns, so every option sorts
+    # explicitly rather than relying on the scan's initial order.
+    if sort_option == "Newest First":
+        filtered_cases.sort(key=itemgetter("_created_at"), reverse=True)
+    elif sort_option == "Oldest First":
+        filtered_cases.sort(key=itemgetter("_created_at"))
     elif sort_option == "Name (A-Z)":
-        filtered_cases.sort(key=lambda x: x.get("name", ""))
+        filtered_cases.sort(key=itemgetter("_name_lower"))
     elif sort_option == "Name (Z-A)":
-        filtered_cases.sort(key=lambda x: x.get("name", ""), reverse=True)
+        filtered_cases.sort(key=itemgetter("_name_lower"), reverse=True)
     
     st.markdown("---")
     
@@ -106,90 +223,156 @@ else:
     if not filtered_cases:
         st.warning("No cases match your search criteria")
     else:
-        for i, case in enumerate(filtered_cases):
+        # Paginate so the widget count per rerun is bounded by the page
+        # size instead of growing with the total number of cases
+        total_pages = max(1, -(-len(filtered_cases) // CASES_PER_PAGE))
+        if total_pages > 1:
+            page = st.number_input(
+                "Page",
+                min_value=1,
+                max_value=total_pages,
+                value=1,
+                help=f"{len(filtered_cases)} cases, {CASES_PER_PAGE} per page"
+            )
+        else:
+            page = 1
+
+        page_cases = filtered_cases[(page - 1) * CASES_PER_PAGE : page * CASES_PER_PAGE]
+
+        # Lightweight list view: a single table widget replaces the ~10
+        # widgets (container, columns, expanders, buttons) per case; the
+        # heavyweight detail panel is materialized only for the selected row
+        table_rows = [
+            {
+                "Name": c.get("name", "Unknown"),
+                "UNHCR Number": c.get("unhcr_number", "N/A"),
+                "Created": f"{c['_created_date_str']} {c['_created_time_str']}" if c["_created_dt"] else "N/A",
+                "Report": "✅" if c.get("pdf_report") and os.path.basename(c["pdf_report"]) in c["_present"] else "❌"
+            }
+            for c in page_cases
+        ]
+
+        selection = st.dataframe(
+            table_rows,
+            use_container_width=True,
+            hide_index=True,
+            on_select="rerun",
+            selection_mode="single-row",
+            key="case_table"
+        )
+
+        selected_rows = selection.selection.rows
+        if not selected_rows:
+            st.caption("Select a row to see case details, downloads, and analysis")
+        else:
+            case = page_cases[selected_rows[0]]
+            # Unpack the case fields once instead of repeating .get chains
+            # throughout the panel body
+            name = case.get("name", "Unknown")
+            unhcr_number = case.get("unhcr_number", "N/A")
+            pdf_path = case.get("pdf_report")
+            audio_file = case.get("audio_file")
+            transcript_english = case.get("transcript_english")
+            case_dir = case.get("case_dir", "")
+            form_count = len(case.get("forms", []))
+            present = case["_present"]
+            # Stable widget keys: tied to the case id, not the row index,
+            # so widget state survives filtering and page changes
+            case_id = case.get("unhcr_number", case_dir)
+
             with st.container():
                 col1, col2, col3 = st.columns([3, 2, 1])
-                
+
                 with col1:
-                    st.markdown(f"### {case.get('name', 'Unknown')}")
-                    st.markdown(f"**UNHCR Number:** `{case.get('unhcr_number', 'N/A')}`")
-                
+                    st.markdown(f"### {name}")
+                    st.markdown(f"**UNHCR Number:** `{unhcr_number}`")
+
                 with col2:
-                    created_date = datetime.fromisoformat(case.get('created_at', ''))
-                    st.markdown(f"**Created:** {created_date.strftime('%B %d, %Y')}")
-                    st.markdown(f"**Time:** {created_date.strftime('%H:%M')}")
-                
+                    st.markdown(f"**Created:** {case['_created_date_str']}")
+                    st.markdown(f"**Time:** {case['_created_time_str']}")
+
                 with col3:
-                    # Download PDF button
-                    pdf_path = case.get("pdf_report")
-                    if pdf_path and os.path.exists(pdf_path):
-                        with open(pdf_path, "rb") as f:
-                            st.download_button(
-                                label="📥 Download",
-                                data=f,
-                                file_name=f"report_{case.get('unhcr_number')}.pdf",
-                                mime="application/pdf",
-                                key=f"download_{i}"
-                            )
+                    # Download PDF button (presence answered from the
+                    # batched _present probe, no stat per rerun). The probe
+                    # can be stale - deleting a report does not bump the
+                    # cases/ dir mtime - so the read itself is guarded too.
+                    pdf_bytes = None
+                    if pdf_path and os.path.basename(pdf_path) in present:
+                        try:
+                            pdf_bytes = _read_bytes(pdf_path, os.stat(pdf_path).st_mtime)
+                        except OSError:
+                            pdf_bytes = None
+                    if pdf_bytes is not None:
+                        st.download_button(
+                            label="📥 Download",
+                            data=pdf_bytes,
+                            file_name=f"report_{unhcr_number}.pdf",
+                            mime="application/pdf",
+                            key=f"download_{case_id}"
+                        )
                     else:
                         st.warning("PDF not found")
-                
-                # Expandable details
-                with st.expander("📋 View Case Details"):
-                    detail_col1, detail_col2 = st.columns(2)
-                    
-                    with detail_col1:
-                        st.markdown("#### Files")
-                        
-                        # Audio file
-                        if case.get("audio_file"):
-                            if os.path.exists(case["audio_file"]):
-                                st.success(f"✅ Audio: {os.path.basename(case['audio_file'])}")
-                            else:
-                                st.error("❌ Audio file missing")
-                        
-                        # Transcripts
-                        if case.get("transcript_english"):
-                            if os.path.exists(case["transcript_english"]):
-                                st.success("✅ English Transcript")
-                                
-                                # Show transcript preview
-                                with open(case["transcript_english"], "r", encoding="utf-8") as f:
-                                    transcript = f.read()
-                                    with st.expander("Preview Transcript"):
-                                        st.text_area(
-                                            "English Translation",
-                                            transcript[:500] + "...",
-                                            height=150,
-                                            disabled=True
-                                        )
-                        
-                        # Forms
-                        form_count = len(case.get("forms", []))
-                        if form_count > 0:
-                            st.success(f"✅ {form_count} PDF form(s)")
-                    
-                    with detail_col2:
-                        st.markdown("#### Actions")
-                        
-                        action_col1, action_col2 = st.columns(2)
-                        
-                        with action_col1:
-                            # View full report button
-                            if st.button("🔍 View Analysis", key=f"view_{i}"):
-                                st.session_state.selected_case = case
-                                st.session_state.show_analysis = True
-                        
-                        with action_col2:
-                            # Open folder button
-                            if st.button("📁 Open Folder", key=f"folder_{i}"):
-                                case_dir = case.get("case_dir")
-                                st.info(f"Case files location:\n\n`{case_dir}`")
-                        
+
+                detail_col1, detail_col2 = st.columns(2)
+
+                with detail_col1:
+                    st.markdown("#### Files")
+
+                    # Audio file
+                    if audio_file:
+                        if os.path.basename(audio_file) in present:
+                            st.success(f"✅ Audio: {os.path.basename(audio_file)}")
+                        else:
+                            st.error("❌ Audio file missing")
+
+                    # Transcripts
+                    if transcript_english:
+                        if os.path.basename(transcript_english) in present:
+                            st.success("✅ English Transcript")
+
+                            # Transcript preview behind a toggle: the head
+                            # read and text_area only exist on reruns where
+                            # the toggle is on, instead of instantiating a
+                            # nested expander regardless
+                            if st.toggle("Show transcript preview", key=f"tp_{case_id}"):
+                                try:
+                                    preview = _read_head(
+                                        transcript_english,
+                                        os.stat(transcript_english).st_mtime
+                                    )
+                                except OSError:
+                                    preview = ""
+                                st.text_area(
+                                    "English Translation",
+                                    preview + "...",
+                                    height=150,
+                                    disabled=True
+                                )
+
+                    # Forms
+                    if form_count > 0:
+                        st.success(f"✅ {form_count} PDF form(s)")
+
+                with detail_col2:
+                    st.markdown("#### Actions")
+
+                    action_col1, action_col2 = st.columns(2)
+
+                    with action_col1:
+                        # View full report button
+                        if st.button("🔍 View Analysis", key=f"view_{case_id}"):
+                            st.session_state.selected_case = case
+                            st.session_state.show_analysis = True
+
+                    with action_col2:
+                        # Open folder button
+                        if st.button("📁 Open Folder", key=f"folder_{case_id}"):
+                            st.info(f"Case files location:\n\n`{case_dir}`")
+
                         st.markdown("---")
                         
                         # Delete button (with confirmation)
-                        if st.button("🗑️ Delete Case", key=f"delete_{i}", type="secondary"):
+                        if st.button("🗑️ Delete Case", key=f"delete_{case_id}", type="secondary"):
                             st.warning("⚠️ Delete functionality not implemented in this PoC")
                 
                 st.markdown("---")
@@ -204,12 +387,10 @@ else:
             if selected_case:
                 st.markdown(f"### {selected_case.get('name')} - {selected_case.get('unhcr_number')}")
                 
-                # Show PDF using iframe
+                # Show PDF using iframe (presence answered from the batched
+                # _present probe instead of a per-rerun exists() stat)
                 pdf_path = selected_case.get("pdf_report")
-                if pdf_path and os.path.exists(pdf_path):
-                    with open(pdf_path, "rb") as f:
-                        pdf_bytes = f.read()
-                    
+                if pdf_path and os.path.basename(pdf_path) in selected_case["_present"]:
                     st.markdown("#### PDF Report")
                     st.info("Download the PDF using the button above to view the full report with all formatting and appendices.")
                     
@@ -249,18 +430,24 @@ else:
                            - Source excerpts
                         """)
                     
-                    # Show transcript
+                    # Show transcript (full read, cached per mtime; EAFP -
+                    # the stat doubles as the existence check)
                     transcript_path = selected_case.get("transcript_english")
-                    if transcript_path and os.path.exists(transcript_path):
-                        with st.expander("📝 Interview Transcript (English)", expanded=False):
-                            with open(transcript_path, "r", encoding="utf-8") as f:
-                                transcript = f.read()
-                            st.text_area(
-                                "Full Transcript",
-                                transcript,
-                                height=300,
-                                disabled=True
+                    if transcript_path:
+                        try:
+                            transcript = _read_text(
+                                transcript_path, os.stat(transcript_path).st_mtime
                             )
+                        except OSError:
+                            transcript = None
+                        if transcript is not None:
+                            with st.expander("📝 Interview Transcript (English)", expanded=False):
+                                st.text_area(
+                                    "Full Transcript",
+                                    transcript,
+                                    height=300,
+                                    disabled=True
+                                )
                     
                     if st.button("← Back to Case List"):
                         st.session_state.show_analysis = False
@@ -274,12 +461,17 @@ st.sidebar.markdown("### 📊 Statistics")
 st.sidebar.metric("Total Cases", len(cases))
 
 if cases:
-    # Calculate some stats
-    this_week = sum(1 for c in cases if 
-                   (datetime.now() - datetime.fromisoformat(c.get('created_at', ''))).days <= 7)
+    # Calculate some stats in a single pass over the pre-parsed timestamps
+    now = datetime.now()
+    this_week = this_month = 0
+    for c in cases:
+        created_dt = c.get("_created_dt")
+        if created_dt is None:
+            continue
+        age_days = (now - created_dt).days
+        this_week += age_days <= 7
+        this_month += age_days <= 30
+
     st.sidebar.metric("This Week", this_week)
-    
-    this_month = sum(1 for c in cases if 
-                    (datetime.now() - datetime.fromisoformat(c.get('created_at', ''))).days <= 30)
     st.sidebar.metric("This Month", this_month)
 
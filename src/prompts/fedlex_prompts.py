@@ -5,6 +5,8 @@ This module contains all prompts used for Swiss Fedlex legal database queries,
 SPARQL generation, routing, and response formatting.
 """
 
+from string import Template
+
 from langchain_core.prompts import ChatPromptTemplate
 
 
@@ -12,6 +14,10 @@ from langchain_core.prompts import ChatPromptTemplate
 # SPARQL GENERATION PROMPT
 # ============================================================================
 
+# Jinja2 template format: the example queries are wrapped in {% raw %} blocks
+# so their braces are literal text instead of f-string escapes. Jinja2 compiles
+# the template once at import; the f-string format re-parses the doubled
+# brace escapes on every .format() call on this hot LLM path.
 SPARQL_GENERATION_PROMPT = ChatPromptTemplate.from_template("""
 You are a SPARQL query expert for the Swiss Fedlex legal database using the JOLux ontology.
 
@@ -38,13 +44,13 @@ CRITICAL RULES:
 
 Note that https://www.fedlex.admin.ch/eli/cc/1999/404/en is the Swiss Constitution.
 
-{schema_info}
+{{ schema_info }}
 
 EXAMPLES:
-
+{% raw %}
 Question: "Find currently applicable laws about asylum"
 Query:
-SELECT DISTINCT ?work ?consolidation ?title ?sr_number ?date ?dateApplicability ?dateEndApplicability WHERE {{{{
+SELECT DISTINCT ?work ?consolidation ?title ?sr_number ?date ?dateApplicability ?dateEndApplicability WHERE {
     ?work a jolux:ConsolidationAbstract ;
           jolux:dateDocument ?date ;
           jolux:isRealizedBy ?expression .
@@ -55,24 +61,24 @@ SELECT DISTINCT ?work ?consolidation ?title ?sr_number ?date ?dateApplicability
     ?expression jolux:language <http://publications.europa.eu/resource/authority/language/DEU> ;
                 jolux:title ?title .
 
-    OPTIONAL {{{{
+    OPTIONAL {
         ?work jolux:classifiedByTaxonomyEntry ?taxonomy .
         ?taxonomy skos:notation ?sr_number .
-    }}}}
+    }
 
-    OPTIONAL {{{{ ?consolidation jolux:dateEndApplicability ?dateEndApplicability }}}}
+    OPTIONAL { ?consolidation jolux:dateEndApplicability ?dateEndApplicability }
 
     FILTER(
         CONTAINS(LCASE(?title), "asyl") ||
         CONTAINS(LCASE(?title), "flüchtling")
     )
-}}}}
+}
 ORDER BY DESC(?date)
 LIMIT 10
 
 Question: "Find recent ordinances about children"
 Query:
-SELECT DISTINCT ?work ?consolidation ?title ?sr_number ?date ?dateApplicability ?dateEndApplicability WHERE {{{{
+SELECT DISTINCT ?work ?consolidation ?title ?sr_number ?date ?dateApplicability ?dateEndApplicability WHERE {
     ?work a jolux:ConsolidationAbstract ;
           jolux:dateDocument ?date ;
           jolux:isRealizedBy ?expression .
@@ -83,28 +89,86 @@ SELECT DISTINCT ?work ?consolidation ?title ?sr_number ?date ?dateApplicability
     ?expression jolux:language <http://publications.europa.eu/resource/authority/language/DEU> ;
                 jolux:title ?title .
 
-    OPTIONAL {{{{
+    OPTIONAL {
         ?work jolux:classifiedByTaxonomyEntry ?taxonomy .
         ?taxonomy skos:notation ?sr_number .
-    }}}}
+    }
 
-    OPTIONAL {{{{ ?consolidation jolux:dateEndApplicability ?dateEndApplicability }}}}
+    OPTIONAL { ?consolidation jolux:dateEndApplicability ?dateEndApplicability }
 
     FILTER(
         CONTAINS(LCASE(?title), "kind") ||
         CONTAINS(LCASE(?title), "jugend") ||
         CONTAINS(LCASE(?title), "minderjährig")
     )
-}}}}
+}
 ORDER BY DESC(?date)
 LIMIT 10
-
+{% endraw %}
 NOW GENERATE A QUERY FOR THIS QUESTION:
 
-Question: {question}
+Question: {{ question }}
 
 SPARQL Query (without prefixes):
-""")
+""", template_format="jinja2")
+
+
+# ============================================================================
+# PARAMETERIZED SPARQL TEMPLATES
+# ============================================================================
+
+# The generated queries all follow the fixed 8-step JOLux pattern from
+# FEDLEX_SCHEMA_INFO with only keywords and language varying. Having the LLM
+# emit just those parameters (see SPARQL_PARAMS_PROMPT) and substituting them
+# into a prepared template saves most of the query-generation output tokens
+# and keeps identical searches byte-identical for the disk cache.
+FEDLEX_TEMPLATES = {
+    "keyword_search_by_lang": Template("""\
+SELECT DISTINCT ?work ?consolidation ?title ?sr_number ?date ?dateApplicability ?dateEndApplicability WHERE {
+    ?work a jolux:ConsolidationAbstract ;
+          jolux:dateDocument ?date ;
+          jolux:isRealizedBy ?expression .
+
+    ?consolidation jolux:isMemberOf ?work ;
+                   jolux:dateApplicability ?dateApplicability .
+
+    ?expression jolux:language $language_uri ;
+                jolux:title ?title .
+
+    OPTIONAL {
+        ?work jolux:classifiedByTaxonomyEntry ?taxonomy .
+        ?taxonomy skos:notation ?sr_number .
+    }
+
+    OPTIONAL { ?consolidation jolux:dateEndApplicability ?dateEndApplicability }
+
+    FILTER(
+        $keyword_filters
+    )
+}
+ORDER BY DESC(?date)
+LIMIT 10""")
+}
+
+
+SPARQL_PARAMS_PROMPT = ChatPromptTemplate.from_template("""
+You are helping query the Swiss Fedlex legal database.
+
+Given a legal question, extract search parameters for a prepared SPARQL
+template. Respond with ONLY a JSON object, no markdown, of the form:
+{% raw %}
+{"keywords": ["...", "..."], "language": "de"}
+{% endraw %}
+- keywords: 2-6 short lowercase search terms likely to appear in Swiss law
+  TITLES. Prefer German terms and word stems ("asyl" also matches
+  "Asylgesetz"); add French/Italian terms where useful.
+- language: one of "de", "fr", "it", "rm" - the language of the titles to
+  search (usually "de").
+
+Question: {{ question }}
+
+JSON:
+""", template_format="jinja2")
 
 
 # ============================================================================